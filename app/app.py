@@ -7,6 +7,8 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 from app.constants import CANVAS_HEIGHT, CANVAS_WIDTH
 from app.logging_setup import setup_logging
 from app.menus.arrange_menu import ArrangeMenu
@@ -20,6 +22,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Minimum time between selection rectangle redraws while dragging (~60 Hz)
+DRAG_REDRAW_INTERVAL_MS = 16
+
 
 class App:
     """Main control and UI for dose customization.
@@ -46,6 +51,8 @@ class App:
         The X coordinate where a drag-selection started.
     selection_start_y : float | None
         The Y coordinate where a drag-selection started.
+    component_clicked : bool
+        Set by a component when it handles a click, so the canvas click handler skips it.
     dimensions_label : tk.Label
         Displays information about the selected component.
     canvas : tk.Canvas
@@ -68,8 +75,15 @@ class App:
         self.selection_rect = None
         self.selection_start_x = None
         self.selection_start_y = None
+        self.component_clicked = False
         self.component_file = None
         self.zoom_factor = 1.0
+        # Structure-of-arrays copy of component bounding boxes used for area selection
+        self._bbox_arr = np.empty((0, 4), dtype=np.int32)
+        self._bbox_comps = []
+        self._bbox_rows = {}
+        self._pending_drag = None
+        self._drag_after_id = None
 
         menubar = tk.Menu(self.root)
         self.root.config(menu=menubar)
@@ -139,6 +153,8 @@ class App:
     def clear_canvas(self) -> None:
         """Clear all components from the canvas."""
         self.canvas.delete("all")
+        self._bbox_comps.clear()
+        self._bbox_rows.clear()
 
     def redraw_canvas(self) -> None:
         """Update the canvas and its contents based on current zoom level."""
@@ -148,6 +164,7 @@ class App:
         self.canvas.config(scrollregion=(0, 0, new_width, new_height))
         for group in self.groups.values():
             for comp in group:
+                comp.update_bbox()
                 comp.redraw_for_zoom()
 
     def on_canvas_click(self, event: tk.Event) -> None:
@@ -156,7 +173,9 @@ class App:
         y = self.canvas.canvasy(event.y) / self.zoom_factor
         logger.debug("Click at (%d, %d)", x, y)
 
-        if not self.canvas.find_withtag("current"):  # nothing was under cursor when clicked
+        self._cancel_drag()
+        # Component item bindings run before this canvas binding and flag clicks they handled
+        if not self.component_clicked:  # nothing was under cursor when clicked
             self.deselect_all()
             self.selection_start_x = x
             self.selection_start_y = y
@@ -164,24 +183,41 @@ class App:
                 self.canvas.delete(self.selection_rect)
                 self.selection_rect = None
         else:
+            self.component_clicked = False
             self.selection_start_x = None
             self.selection_start_y = None
 
     def on_canvas_drag(self, event: tk.Event) -> None:
-        """Handle the drag event on the canvas."""
+        """Handle the drag event on the canvas.
+
+        Motion events are coalesced: only the latest position is kept and the selection
+        rectangle is redrawn at most once per DRAG_REDRAW_INTERVAL_MS.
+        """
         if self.selection_start_x is not None and self.selection_start_y is not None:
             x = self.canvas.canvasx(event.x) / self.zoom_factor
             y = self.canvas.canvasy(event.y) / self.zoom_factor
+            self._pending_drag = (x, y)
+            if self._drag_after_id is None:
+                self._drag_after_id = self.root.after(DRAG_REDRAW_INTERVAL_MS, self._flush_drag)
+
+    def _flush_drag(self) -> None:
+        """Redraw the selection rectangle at the latest pending drag position."""
+        self._drag_after_id = None
+        if self._pending_drag is None or self.selection_start_x is None or self.selection_start_y is None:
+            return
+        x, y = self._pending_drag
+        self._pending_drag = None
 
-            if self.selection_rect:
-                self.canvas.delete(self.selection_rect)
-
-            # Scale coordinates for display
-            scaled_start_x = self.selection_start_x * self.zoom_factor
-            scaled_start_y = self.selection_start_y * self.zoom_factor
-            scaled_x = x * self.zoom_factor
-            scaled_y = y * self.zoom_factor
+        # Scale coordinates for display
+        scaled_start_x = self.selection_start_x * self.zoom_factor
+        scaled_start_y = self.selection_start_y * self.zoom_factor
+        scaled_x = x * self.zoom_factor
+        scaled_y = y * self.zoom_factor
 
+        # Create the rectangle once per drag, then move its corners in place
+        if self.selection_rect:
+            self.canvas.coords(self.selection_rect, scaled_start_x, scaled_start_y, scaled_x, scaled_y)
+        else:
             self.selection_rect = self.canvas.create_rectangle(
                 scaled_start_x,
                 scaled_start_y,
@@ -191,11 +227,24 @@ class App:
                 dash=(2, 2),
             )
 
+    def _cancel_drag(self) -> None:
+        """Drop any pending drag redraw."""
+        if self._drag_after_id is not None:
+            self.root.after_cancel(self._drag_after_id)
+            self._drag_after_id = None
+        self._pending_drag = None
+
     def on_canvas_release(self, event: tk.Event) -> None:
         """Handle the release event on the canvas."""
         x = self.canvas.canvasx(event.x)
         y = self.canvas.canvasy(event.y)
         logger.debug("Release at (%d, %d)", x, y)
+
+        # Apply the final drag position now rather than waiting for the scheduled redraw
+        if self._drag_after_id is not None:
+            self.root.after_cancel(self._drag_after_id)
+        self._flush_drag()
+
         if self.selection_rect:
             x1, y1, x2, y2 = self.canvas.coords(self.selection_rect)
             self.select_components_in_area(x1, y1, x2, y2)
@@ -210,18 +259,57 @@ class App:
         x2 = x2 / self.zoom_factor
         y2 = y2 / self.zoom_factor
 
-        for group in self.groups.values():
-            for comp in group:
-                if (
-                    comp.x >= min(x1, x2)
-                    and comp.x + self.comp_width <= max(x1, x2)
-                    and comp.y >= min(y1, y2)
-                    and comp.y + self.comp_height <= max(y1, y2)
-                ):
-                    comp.select()
+        # Normalize the rectangle once so the per-component test is four plain comparisons
+        left, right = (x1, x2) if x1 <= x2 else (x2, x1)
+        top, bottom = (y1, y2) if y1 <= y2 else (y2, y1)
+
+        # Test every bounding box at once instead of reading component attributes one by one
+        arr = self._bbox_arr[: len(self._bbox_comps)]
+        mask = (arr[:, 0] >= left) & (arr[:, 2] <= right) & (arr[:, 1] >= top) & (arr[:, 3] <= bottom)
+        for row in np.flatnonzero(mask):
+            self._bbox_comps[row].select()
         if self.selection:
             self.update_label(self.selection[0])
 
+    def index_component(self, comp: Component) -> None:
+        """Add a component to the area selection arrays, or update its bounding box there.
+
+        Parameters
+        ----------
+        comp : Component
+            The component whose cached bounding box should be stored.
+
+        """
+        row = self._bbox_rows.get(comp)
+        if row is None:
+            row = len(self._bbox_comps)
+            if row == len(self._bbox_arr):
+                grown = np.empty((max(64, 2 * row), 4), dtype=np.int32)
+                grown[:row] = self._bbox_arr[:row]
+                self._bbox_arr = grown
+            self._bbox_comps.append(comp)
+            self._bbox_rows[comp] = row
+        self._bbox_arr[row] = comp.bbox
+
+    def unindex_component(self, comp: Component) -> None:
+        """Remove a component from the area selection arrays.
+
+        Parameters
+        ----------
+        comp : Component
+            The component to remove.
+
+        """
+        row = self._bbox_rows.pop(comp, None)
+        if row is None:
+            return
+        # Move the last row into the freed slot to keep the arrays dense
+        last_comp = self._bbox_comps.pop()
+        if last_comp is not comp:
+            self._bbox_arr[row] = self._bbox_arr[len(self._bbox_comps)]
+            self._bbox_comps[row] = last_comp
+            self._bbox_rows[last_comp] = row
+
     def deselect_all(self) -> None:
         """Deselect all components."""
         for comp in self.selection[:]:  # operate on a copy of the list since it will be modified
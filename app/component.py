@@ -39,6 +39,8 @@ class Component:
         The group to which the component belongs.
     dragged : bool
         Whether the component was dragged.
+    bbox : tuple[int, int, int, int] | None
+        The cached unscaled (x_min, y_min, x_max, y_max) of the component, as used for area selection.
 
     """
 
@@ -84,6 +86,8 @@ class Component:
         self.app.canvas.tag_bind(self.comp, "<Button-1>", self.on_click)
         self.app.canvas.tag_bind(self.comp, "<B1-Motion>", self.on_drag)
         self.app.canvas.tag_bind(self.comp, "<ButtonRelease-1>", self.on_release)
+        self.bbox = None
+        self.update_bbox()
         self.redraw_for_zoom()
 
     def on_click(self, event: tk.Event) -> None:
@@ -95,6 +99,9 @@ class Component:
             The event object containing information about the click event.
 
         """
+        # Tell the canvas-wide click handler, which runs next, that this click hit a component
+        self.app.component_clicked = True
+
         if event.state & SHIFT_KEY:
             self.toggle_selection()
         elif self not in self.app.selection:
@@ -141,6 +148,9 @@ class Component:
     def delete(self) -> None:
         """Delete the component from the canvas."""
         self.app.canvas.delete(self.comp)
+        if self.bbox is not None:
+            self.app.unindex_component(self)
+            self.bbox = None
 
     def set_color(self, color: str) -> None:
         """Set the color of the component.
@@ -198,8 +208,17 @@ class Component:
         """
         self.x = int(x)
         self.y = int(y)
+        self.update_bbox()
         self.redraw_for_zoom()
 
+    def update_bbox(self) -> None:
+        """Recompute the cached bounding box and update it in the app's area selection arrays."""
+        bbox = (self.x, self.y, self.x + self.app.comp_width, self.y + self.app.comp_height)
+        if bbox == self.bbox:
+            return
+        self.bbox = bbox
+        self.app.index_component(self)
+
     def to_dict(self) -> tuple[int, int]:
         """Convert the component position to a tuple.
 
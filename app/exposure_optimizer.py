@@ -1,18 +1,39 @@
 """Optimize print time by combining non-overlapping images with similar settings."""
 
 import copy
+import functools
+import hashlib
+import json
 import logging
+import os
+import tempfile
+import zipfile
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
 from typing import Any
 
-from PIL import Image, ImageChops
+import numpy as np
+from PIL import Image
 
-from app.constants import CANVAS_HEIGHT, CANVAS_WIDTH
-from app.graph_coloring import partition_images
-from app.print_file_utils import load_print_file, save_print_file
+from app.graph_coloring import pack_mask, partition_images
+from app.print_file_utils import (
+    check_print_file_path,
+    collect_referenced_images,
+    read_print_settings,
+    read_slice,
+    write_slice,
+)
 
 logger = logging.getLogger(__name__)
 
+# Settings that may differ between images that are still combined into one exposure group
+GROUPING_EXCLUDED_KEYS = frozenset({"Image file", "Layer exposure time (ms)"})
+
+# Number of decoded slices kept while streaming a print file (each is a full canvas)
+SLICE_CACHE_SIZE = 16
+
 
 def group_by_settings(image_settings: list[dict[str, Any]]) -> dict[tuple[tuple[str, Any], ...], list[dict[str, Any]]]:
     """Group images where all image settings are the same except name and exposure time.
@@ -28,21 +49,64 @@ def group_by_settings(image_settings: list[dict[str, Any]]) -> dict[tuple[tuple[
         Dictionary mapping parameter tuples to lists of image settings that share those parameters.
 
     """
-
-    def get_image_key(settings: dict[str, Any]) -> tuple[tuple[str, Any], ...]:
-        return tuple((k, v) for k, v in sorted(settings.items()) if k not in {"Image file", "Layer exposure time (ms)"})
-
     groups: dict[tuple[tuple[str, Any], ...], list[dict[str, Any]]] = {}
     for settings in image_settings:
-        key = get_image_key(settings)
-        if key not in groups:
-            groups[key] = []
-        groups[key].append(settings)
+        key = tuple(sorted((k, v) for k, v in settings.items() if k not in GROUPING_EXCLUDED_KEYS))
+        groups.setdefault(key, []).append(settings)
 
     logger.debug("Grouped %d images into %d distinct setting groups", len(image_settings), len(groups))
     return groups
 
 
+def _partition_exposures(
+    stack: list[np.ndarray] | np.ndarray,
+    times: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Split overlapping progressive exposures into one composite per exposure step.
+
+    Every pixel is exposed for the longest time of any image covering it: step ``i``
+    exposes the union of images ``i`` onwards for ``times[i] - times[i - 1]``. The
+    composites are suffix maxima of the stack, so they are built in a single reverse
+    pass, each one starting from the composite of the step after it.
+
+    Parameters
+    ----------
+    stack : list[np.ndarray] | np.ndarray
+        N uint8 arrays of shape (H, W), sorted by ascending exposure time.
+    times : np.ndarray
+        int64[N] exposure times matching the stack.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray]
+        Tuple containing the uint8[M, H, W] composites, the int64[M] exposure time of
+        each composite and the index of the stack entry each composite starts at.
+        Steps that add no exposure time or cover no pixels are omitted.
+
+    """
+    exposure_diffs = np.diff(times, prepend=0)
+    steps = np.flatnonzero(exposure_diffs > 0)
+
+    # Fold each step's images into a copy of the next step's composite, latest step first
+    shape = stack[0].shape if len(stack) else (0, 0)
+    out = np.empty((len(steps), *shape), dtype=np.uint8)
+    end = len(stack)
+    for k in range(len(steps) - 1, -1, -1):
+        start = steps[k]
+        if k == len(steps) - 1:
+            out[k] = stack[start]
+        else:
+            np.maximum(out[k + 1], stack[start], out=out[k])
+        for j in range(start + 1, end):
+            np.maximum(out[k], stack[j], out=out[k])
+        end = start
+
+    # Only keep composites that contain non-zero pixels
+    nonempty = out.reshape(len(steps), -1).any(axis=1)
+    logger.debug("Partitioned %d images into %d exposure steps", len(stack), int(nonempty.sum()))
+    return out[nonempty], exposure_diffs[steps][nonempty], steps[nonempty]
+
+
 def combine_exposures(
     group: list[dict[str, Any]],
     group_images: list[Image.Image],
@@ -68,46 +132,20 @@ def combine_exposures(
     logger.debug("Combining exposures for group with %d images", len(group))
     new_settings = []
     new_images = {}
-    prev_exposure = 0
-
-    # First pass: create composite images for each unique exposure time
-    composites = {}
-    for i, settings in enumerate(group):
-        current_exposure = settings["Layer exposure time (ms)"]
-        exposure_diff = current_exposure - prev_exposure
-
-        if exposure_diff > 0:
-            logger.debug(
-                "Processing exposure step %d: current=%d, prev=%d, diff=%d",
-                i,
-                current_exposure,
-                prev_exposure,
-                exposure_diff,
-            )
-
-            # Create composite of all images from this index onwards
-            composite = Image.new("L", (CANVAS_WIDTH, CANVAS_HEIGHT), color=0)
-
-            # Use a copy of each image to avoid modifying the original
-            for j in range(i, len(group_images)):
-                img_copy = group_images[j].copy()
-                composite = ImageChops.lighter(composite, img_copy)
-
-            # Only store composite if it contains non-zero pixels
-            if composite.getbbox() is not None:
-                composites[i] = (composite, exposure_diff)
-                logger.debug("Created composite image for index %d with exposure diff %d", i, exposure_diff)
-
-        prev_exposure = current_exposure
-
-    # Second pass: create settings for composite images
-    for i, (composite, exposure_diff) in composites.items():
+
+    # Zero-copy views of the source images, already sorted by exposure time
+    stack = [np.asarray(img) for img in group_images]
+    times = np.array([settings["Layer exposure time (ms)"] for settings in group], dtype=np.int64)
+    composites, exposure_diffs, step_indices = _partition_exposures(stack, times)
+
+    # Create settings for composite images
+    for accum, exposure_diff, i in zip(composites, exposure_diffs.tolist(), step_indices.tolist(), strict=True):
         settings = copy.deepcopy(group[i])
         new_img_name = f"{Path(settings['Image file']).stem}_opt_{i}.png"
         new_setting = {**settings, "Image file": new_img_name, "Layer exposure time (ms)": exposure_diff}
 
-        # Store a copy of the composite image to avoid any reference issues
-        new_images[new_img_name] = composite.copy()
+        # Only convert back to a PIL image once the composite is final
+        new_images[new_img_name] = Image.fromarray(accum, "L")
         new_settings.append(new_setting)
         logger.debug("Created optimized setting: %s with exposure %d ms", new_img_name, exposure_diff)
 
@@ -115,6 +153,24 @@ def combine_exposures(
     return new_settings, new_images
 
 
+def _any_overlap(images: Iterable[Image.Image]) -> bool:
+    """Return True if any two images share a non-zero pixel.
+
+    A running union of the 1-bit packed masks seen so far is kept, so each image is
+    checked once and the union and overlap tests touch an eighth of the pixel bytes.
+    """
+    covered = None
+    for img in images:
+        mask = pack_mask(img)
+        if covered is None:
+            covered = mask
+        elif np.bitwise_and(covered, mask).any():
+            return True
+        else:
+            np.bitwise_or(covered, mask, out=covered)
+    return False
+
+
 def optimize_layer(
     image_settings: list[dict[str, Any]],
     images: dict[str, Image.Image],
@@ -158,12 +214,16 @@ def optimize_layer(
         # Sort by exposure time to process in order
         group_settings.sort(key=lambda x: x["Layer exposure time (ms)"])
 
-        # Create a dictionary of images for this group
-        group_images_dict = {s["Image file"]: images[s["Image file"]].copy() for s in group_settings}
+        # Create a dictionary of images for this group (read-only, so no copies are needed)
+        group_images_dict = {s["Image file"]: images[s["Image file"]] for s in group_settings}
 
-        # Use graph coloring to partition images into non-overlapping groups
-        logger.debug("Partitioning images in group %d using graph coloring", group_idx)
-        partitioned_groups = partition_images(group_images_dict)
+        # Disjoint images always form a single partition, so only run graph coloring on overlaps
+        if _any_overlap(group_images_dict.values()):
+            logger.debug("Partitioning images in group %d using graph coloring", group_idx)
+            partitioned_groups = partition_images(group_images_dict)
+        else:
+            logger.debug("Images in group %d do not overlap, skipping partitioning", group_idx)
+            partitioned_groups = {0: list(group_images_dict)}
 
         # Process each non-overlapping partition
         for partition_idx, image_names in partitioned_groups.items():
@@ -171,11 +231,11 @@ def optimize_layer(
 
             # Get settings and images for this partition
             settings = [s for s in group_settings if s["Image file"] in image_names]
-            images = [group_images_dict[name] for name in image_names]
+            partition_images_list = [group_images_dict[s["Image file"]] for s in settings]
 
             # Create optimized exposures by combining images in this partition
             logger.debug("Optimizing exposures for partition %d", partition_idx)
-            optimized_settings, optimized_images = combine_exposures(settings, images)
+            optimized_settings, optimized_images = combine_exposures(settings, partition_images_list)
             new_settings.extend(optimized_settings)
             new_images.update(optimized_images)
             logger.debug("Created %d optimized images for partition %d", len(optimized_images), partition_idx)
@@ -189,9 +249,136 @@ def optimize_layer(
     return new_settings, new_images
 
 
+def _pack_images(images: dict[str, Image.Image]) -> dict[str, tuple[str, tuple[int, int], bytes]]:
+    """Convert images to their mode, size and raw bytes so they can be sent to worker processes cheaply."""
+    return {name: (img.mode, img.size, img.tobytes()) for name, img in images.items()}
+
+
+def _unpack_images(packed: dict[str, tuple[str, tuple[int, int], bytes]]) -> dict[str, Image.Image]:
+    """Rebuild images from the raw bytes produced by _pack_images."""
+    return {name: Image.frombytes(mode, size, data) for name, (mode, size, data) in packed.items()}
+
+
+def _optimize_layer_worker(
+    image_settings: list[dict[str, Any]],
+    packed_images: dict[str, tuple[str, tuple[int, int], bytes]],
+) -> tuple[list[dict[str, Any]], dict[str, tuple[str, tuple[int, int], bytes]]]:
+    """Run optimize_layer in a worker process on packed images and pack the results."""
+    optimized_settings, new_images = optimize_layer(image_settings, _unpack_images(packed_images))
+    return optimized_settings, _pack_images(new_images)
+
+
+def _optimize_layers(
+    layers: Iterable[tuple[int, list[dict[str, Any]], dict[str, Image.Image]]],
+    jobs: int = 1,
+) -> Iterator[tuple[int, dict[str, Image.Image], list[dict[str, Any]], dict[str, Image.Image]]]:
+    """Optimize layers in order, optionally spreading them over a process pool.
+
+    Layers are independent, so with ``jobs > 1`` they are optimized in parallel. At most
+    ``2 * jobs`` layers are in flight at once so callers that stream layers from disk keep
+    a bounded working set.
+
+    Parameters
+    ----------
+    layers : Iterable[tuple[int, list[dict[str, Any]], dict[str, Image.Image]]]
+        (layer index, image settings, images) for each layer to optimize.
+    jobs : int, optional
+        Number of worker processes, by default 1 (optimize in this process).
+
+    Yields
+    ------
+    tuple[int, dict[str, Image.Image], list[dict[str, Any]], dict[str, Image.Image]]
+        (layer index, input images, optimized settings, new images) in input order.
+
+    """
+    jobs = min(jobs, os.cpu_count() or 1)
+    if jobs <= 1:
+        for i, image_settings, layer_images in layers:
+            optimized_settings, new_images = optimize_layer(image_settings, layer_images)
+            yield i, layer_images, optimized_settings, new_images
+        return
+
+    logger.info("Optimizing layers with %d worker processes", jobs)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending: deque[tuple[int, dict[str, Image.Image], Future]] = deque()
+
+        def collect() -> tuple[int, dict[str, Image.Image], list[dict[str, Any]], dict[str, Image.Image]]:
+            i, layer_images, future = pending.popleft()
+            optimized_settings, packed_images = future.result()
+            return i, layer_images, optimized_settings, _unpack_images(packed_images)
+
+        for i, image_settings, layer_images in layers:
+            future = executor.submit(_optimize_layer_worker, image_settings, _pack_images(layer_images))
+            pending.append((i, layer_images, future))
+            if len(pending) >= 2 * jobs:
+                yield collect()
+        while pending:
+            yield collect()
+
+
+def _dedupe_images(
+    optimized_settings: list[dict[str, Any]],
+    new_images: dict[str, Image.Image],
+    content_map: dict[bytes, str],
+    name_map: dict[str, bytes],
+) -> dict[str, Image.Image]:
+    """Reuse previously emitted images with identical pixels instead of storing duplicates.
+
+    Composite names repeat whenever layers reuse a slice, so a new image whose name was
+    already emitted with different pixels is given a fresh name rather than replacing it.
+
+    Parameters
+    ----------
+    optimized_settings : list[dict[str, Any]]
+        Settings for a layer; entries pointing at a duplicate or renamed image are updated in place.
+    new_images : dict[str, Image.Image]
+        Images created while optimizing the layer.
+    content_map : dict[bytes, str]
+        Digest of every image emitted so far mapped to its filename; updated in place.
+    name_map : dict[str, bytes]
+        Filename of every image emitted so far mapped to its digest; updated in place.
+
+    Returns
+    -------
+    dict[str, Image.Image]
+        The new images whose contents had not been seen before, keyed by their final names.
+
+    """
+    unique_images = {}
+    renamed = {}
+    for name, img in new_images.items():
+        digest = hashlib.blake2b(np.asarray(img), digest_size=16).digest()
+        existing = content_map.get(digest)
+        if existing is not None:
+            if existing != name:
+                renamed[name] = existing
+            continue
+
+        final_name = name
+        if final_name in name_map:
+            path = Path(name)
+            suffix = 1
+            while final_name in name_map:
+                final_name = f"{path.stem}_{suffix}{path.suffix}"
+                suffix += 1
+            renamed[name] = final_name
+        content_map[digest] = final_name
+        name_map[final_name] = digest
+        unique_images[final_name] = img
+
+    for setting in optimized_settings:
+        if setting["Image file"] in renamed:
+            setting["Image file"] = renamed[setting["Image file"]]
+
+    if renamed:
+        logger.debug("Renamed %d images to reuse identical or avoid clashing ones", len(renamed))
+    return unique_images
+
+
 def optimize_print_settings(
     print_settings: dict[str, Any],
     images: dict[str, Image.Image],
+    jobs: int = 1,
 ) -> tuple[dict[str, Any], dict[str, Image.Image]]:
     """Optimize print settings by combining non-overlapping images with similar settings.
 
@@ -201,6 +388,8 @@ def optimize_print_settings(
         Dictionary containing print settings including layers.
     images : dict[str, Image.Image]
         Dictionary mapping filenames to PIL Image objects.
+    jobs : int, optional
+        Number of worker processes used to optimize layers, by default 1.
 
     Returns
     -------
@@ -215,32 +404,38 @@ def optimize_print_settings(
     total_layers = len(new_settings.get("Layers", []))
     logger.info("Processing %d layers", total_layers)
 
-    # Process each layer
-    for i, layer in enumerate(new_settings.get("Layers", [])):
-        logger.debug("Processing layer %d/%d", i + 1, total_layers)
-
-        # Get image settings and filter for valid images
-        image_settings = layer.get("Image settings list", [])
-        if not image_settings:
-            logger.debug("Skipping layer %d: no image settings", i + 1)
-            continue
+    def layer_args() -> Iterator[tuple[int, list[dict[str, Any]], dict[str, Image.Image]]]:
+        for i, layer in enumerate(new_settings.get("Layers", [])):
+            logger.debug("Processing layer %d/%d", i + 1, total_layers)
+
+            # Get image settings and filter for valid images
+            image_settings = layer.get("Image settings list", [])
+            if not image_settings:
+                logger.debug("Skipping layer %d: no image settings", i + 1)
+                continue
+
+            # Get only the images needed for this layer's settings
+            layer_images = {}
+            for img_setting in image_settings:
+                img_name = img_setting["Image file"]
+                if img_name in all_images:
+                    layer_images[img_name] = all_images[img_name]
+                else:
+                    logger.warning("Image %s not found in available images", img_name)
+
+            # Skip layers with no valid images
+            if not layer_images:
+                logger.debug("Skipping layer %d: no valid images found", i + 1)
+                continue
+
+            logger.info("Optimizing layer %d with %d images", i + 1, len(layer_images))
+            yield i, image_settings, layer_images
 
-        # Get only the images needed for this layer's settings
-        layer_images = {}
-        for img_setting in image_settings:
-            img_name = img_setting["Image file"]
-            if img_name in all_images:
-                layer_images[img_name] = all_images[img_name]
-            else:
-                logger.warning("Image %s not found in available images", img_name)
-
-        # Skip layers with no valid images
-        if not layer_images:
-            logger.debug("Skipping layer %d: no valid images found", i + 1)
-            continue
-
-        logger.info("Optimizing layer %d with %d images", i + 1, len(layer_images))
-        optimized_settings, new_images = optimize_layer(image_settings, layer_images)
+    # Process each layer
+    content_map: dict[bytes, str] = {}
+    name_map: dict[str, bytes] = {}
+    for i, _, optimized_settings, layer_new_images in _optimize_layers(layer_args(), jobs):
+        new_images = _dedupe_images(optimized_settings, layer_new_images, content_map, name_map)
 
         # Update the layer with optimized settings
         new_settings["Layers"][i]["Image settings list"] = optimized_settings
@@ -253,15 +448,140 @@ def optimize_print_settings(
     return new_settings, all_images
 
 
-def optimize_print_file(input_path: Path, output_path: Path | None = None) -> None:
+def _write_layer_images(
+    zf: zipfile.ZipFile,
+    optimized_settings: list[dict[str, Any]],
+    images: dict[str, Image.Image],
+    written_images: set[str],
+) -> None:
+    """Write the images a layer references that are not in the output print file yet.
+
+    Parameters
+    ----------
+    zf : zipfile.ZipFile
+        The output print file opened for writing.
+    optimized_settings : list[dict[str, Any]]
+        The layer's optimized image settings.
+    images : dict[str, Image.Image]
+        The layer's source slices and new composites, by filename.
+    written_images : set[str]
+        Filenames already written; updated in place.
+
+    """
+    for setting in optimized_settings:
+        img_name = setting["Image file"]
+        if img_name not in written_images:
+            write_slice(zf, img_name, images[img_name], compress_level=1)
+            written_images.add(img_name)
+
+
+def _write_remaining_images(
+    zf: zipfile.ZipFile,
+    print_settings: dict[str, Any],
+    decode_slice: Callable[[str], Image.Image],
+    written_images: set[str],
+) -> None:
+    """Copy images referenced outside the layers, such as the default layer image, from the input print file.
+
+    Parameters
+    ----------
+    zf : zipfile.ZipFile
+        The output print file opened for writing.
+    print_settings : dict[str, Any]
+        The optimized print settings.
+    decode_slice : Callable[[str], Image.Image]
+        Reads a slice from the input print file by filename.
+    written_images : set[str]
+        Filenames already written; updated in place.
+
+    """
+    for img_name in sorted(collect_referenced_images(print_settings) - written_images):
+        try:
+            img = decode_slice(img_name)
+        except KeyError:
+            logger.warning("Referenced image %s not found in the input print file", img_name)
+            continue
+        write_slice(zf, img_name, img, compress_level=1)
+        written_images.add(img_name)
+
+
+def _stream_print_file(input_path: Path, output_path: Path, jobs: int) -> int:
+    """Optimize a print file layer by layer, writing each layer's images as soon as it is done.
+
+    Parameters
+    ----------
+    input_path : Path
+        Path to input zip file containing print settings and images.
+    output_path : Path
+        Path the optimized zip file is written to.
+    jobs : int
+        Number of worker processes used to optimize layers.
+
+    Returns
+    -------
+    int
+        The number of images written.
+
+    """
+    with zipfile.ZipFile(input_path, "r") as zf_in:
+        logger.info("Loading print settings from %s", input_path)
+        print_settings = read_print_settings(zf_in)
+
+        # Slices are already PNG-compressed, so cheap zlib levels barely grow the archive
+        with zipfile.ZipFile(output_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zf_out:
+            zf_out.writestr("slices/", "")
+            written_images: set[str] = set()
+
+            layers = print_settings.get("Layers", [])
+            logger.info("Processing %d layers", len(layers))
+
+            # Consecutive layers often reuse the same slice files, so keep recent decodes around
+            decode_slice = functools.lru_cache(maxsize=SLICE_CACHE_SIZE)(functools.partial(read_slice, zf_in))
+
+            def layer_args() -> Iterator[tuple[int, list[dict[str, Any]], dict[str, Image.Image]]]:
+                for i, layer in enumerate(layers):
+                    image_settings = layer.get("Image settings list", [])
+                    if not image_settings:
+                        logger.debug("Skipping layer %d: no image settings", i + 1)
+                        continue
+                    layer_images = {s["Image file"]: decode_slice(s["Image file"]) for s in image_settings}
+                    logger.info("Optimizing layer %d with %d images", i + 1, len(layer_images))
+                    yield i, image_settings, layer_images
+
+            content_map: dict[bytes, str] = {}
+            name_map: dict[str, bytes] = {}
+            for i, layer_images, optimized_settings, layer_new_images in _optimize_layers(layer_args(), jobs):
+                new_images = _dedupe_images(optimized_settings, layer_new_images, content_map, name_map)
+                layers[i]["Image settings list"] = optimized_settings
+
+                # Write this layer's images now so they can be released before the next layer
+                _write_layer_images(zf_out, optimized_settings, {**layer_images, **new_images}, written_images)
+
+            # The default layer image is referenced outside the layers, so it may not be written yet
+            _write_remaining_images(zf_out, print_settings, decode_slice, written_images)
+
+            logger.debug("Writing print_settings.json")
+            zf_out.writestr("print_settings.json", json.dumps(print_settings, indent=2))
+
+    return len(written_images)
+
+
+def optimize_print_file(input_path: Path, output_path: Path | None = None, jobs: int = 1) -> None:
     """Load print file from zip, optimize it, and save the results to a zip file.
 
+    Layers are streamed: each layer's slices are decoded from the input zip, optimized and
+    written to the output zip before the next layer is read, so only one layer's images
+    are held in memory at a time. The output is written to a temporary file that only
+    replaces output_path once it is complete, so output_path may be the input file itself.
+
     Parameters
     ----------
     input_path : Path
         Path to input zip file containing print settings and images.
     output_path : Path | None, optional
         Path to output zip file. If None, uses input name + '_optimized.zip'.
+    jobs : int, optional
+        Number of worker processes used to optimize layers, by default 1.
 
     """
     if output_path is None:
@@ -270,17 +590,19 @@ def optimize_print_file(input_path: Path, output_path: Path | None = None) -> No
     logger.info("Starting print file optimization: %s → %s", input_path, output_path)
 
     try:
-        logger.info("Loading print file from %s", input_path)
-        print_settings, images = load_print_file(input_path)
-        logger.debug("Loaded %d images from input file", len(images))
+        check_print_file_path(input_path)
 
-        logger.info("Optimizing print settings")
-        optimized_settings, all_images = optimize_print_settings(print_settings, images)
-        logger.debug("Optimization complete: %d total images after optimization", len(all_images))
+        fd, tmp_name = tempfile.mkstemp(dir=output_path.parent, prefix=f".{output_path.stem}.", suffix=".zip")
+        os.close(fd)
+        tmp_path = Path(tmp_name)
+        try:
+            written = _stream_print_file(input_path, tmp_path, jobs)
+            tmp_path.replace(output_path)
+        finally:
+            # Only left behind if optimizing failed
+            tmp_path.unlink(missing_ok=True)
 
-        logger.info("Saving optimized files to %s", output_path)
-        save_print_file(output_path, optimized_settings, all_images)
-        logger.info("Optimization complete! Files saved successfully")
+        logger.info("Optimization complete! %d images saved to %s", written, output_path)
 
     except Exception:
         logger.exception("Failed to optimize print file")
@@ -288,17 +610,16 @@ def optimize_print_file(input_path: Path, output_path: Path | None = None) -> No
 
 
 if __name__ == "__main__":
-    import sys
+    import argparse
 
     from app.logging_setup import setup_logging
 
     setup_logging()
 
-    if len(sys.argv) > 1:
-        input_path = Path(sys.argv[1])
-        logger.info("Starting optimization with input file: %s", input_path)
-    else:
-        logger.error("No input file specified")
-        logger.info("Usage: python exposure_optimizer.py <path_to_print_file.zip>")
-        sys.exit(1)
-    optimize_print_file(input_path)
+    parser = argparse.ArgumentParser(description="Combine non-overlapping exposures in a print file.")
+    parser.add_argument("input_path", type=Path, help="path to the print file .zip")
+    parser.add_argument("--jobs", type=int, default=1, help="number of worker processes (default: 1)")
+    args = parser.parse_args()
+
+    logger.info("Starting optimization with input file: %s", args.input_path)
+    optimize_print_file(args.input_path, jobs=args.jobs)
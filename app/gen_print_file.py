@@ -4,7 +4,8 @@ import copy
 import logging
 from pathlib import Path
 
-from PIL import Image, ImageChops
+import numpy as np
+from PIL import Image
 
 from app.constants import CANVAS_HEIGHT, CANVAS_WIDTH
 from app.exposure_optimizer import optimize_print_settings
@@ -29,14 +30,24 @@ def gen_group_composite(base_image: Image.Image, group_settings: list[dict]) ->
         The composite image combining all parts.
 
     """
-    composite_image = Image.new("L", (CANVAS_WIDTH, CANVAS_HEIGHT), color=0)
+    base = np.asarray(base_image)
+    base_height, base_width = base.shape
+    composite = np.zeros((CANVAS_HEIGHT, CANVAS_WIDTH), dtype=np.uint8)
     for component in group_settings:
         offset_x = component["x"]
         offset_y = component["y"]
-        temp_img = Image.new("L", (CANVAS_WIDTH, CANVAS_HEIGHT), color=0)
-        temp_img.paste(base_image, (offset_x, offset_y))
-        composite_image = ImageChops.lighter(composite_image, temp_img)
-    return composite_image
+
+        # Clip the placed image to the canvas, as Image.paste would
+        left, top = max(offset_x, 0), max(offset_y, 0)
+        right = min(offset_x + base_width, CANVAS_WIDTH)
+        bottom = min(offset_y + base_height, CANVAS_HEIGHT)
+        if left >= right or top >= bottom:
+            continue
+
+        # Lighten just the covered region in place rather than a full-canvas image per component
+        region = composite[top:bottom, left:right]
+        np.maximum(region, base[top - offset_y : bottom - offset_y, left - offset_x : right - offset_x], out=region)
+    return Image.fromarray(composite, "L")
 
 
 def create_exposure_config(layout_data: list) -> dict:
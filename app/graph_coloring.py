@@ -4,37 +4,57 @@ import logging
 from collections import defaultdict
 
 import networkx as nx
-from PIL import Image, ImageChops
+import numpy as np
+from PIL import Image
 
 logger = logging.getLogger(__name__)
 
 
-def check_overlap(img1: Image.Image, img2: Image.Image) -> bool:
-    """Efficiently check if two images have overlapping white pixels."""
-    # First check bounding boxes for quick rejection
-    bbox1 = img1.getbbox()
-    bbox2 = img2.getbbox()
+def pack_mask(img: Image.Image) -> np.ndarray:
+    """Pack the non-zero pixels of an image into a 1-bit mask, eight pixels per byte along each row."""
+    return np.packbits(np.asarray(img) > 0, axis=-1)
+
 
+def _overlap_bbox(
+    bbox1: tuple[int, int, int, int] | None,
+    bbox2: tuple[int, int, int, int] | None,
+) -> tuple[int, int, int, int] | None:
+    """Return the intersection of two bounding boxes, or None if either is missing or they don't overlap."""
     if bbox1 is None or bbox2 is None:
-        return False  # One image is empty
+        return None  # One image is empty
 
-    # Check if bounding boxes overlap
     x1, y1, x2, y2 = bbox1
     x3, y3, x4, y4 = bbox2
 
     if x2 <= x3 or x4 <= x1 or y2 <= y3 or y4 <= y1:
-        return False  # Bounding boxes don't overlap
+        return None  # Bounding boxes don't overlap
 
-    # Find the overlapping region
-    overlap_bbox = (max(x1, x3), max(y1, y3), min(x2, x4), min(y2, y4))
+    return (max(x1, x3), max(y1, y3), min(x2, x4), min(y2, y4))
 
-    # Crop to the overlapping region
-    crop1 = img1.crop(overlap_bbox)
-    crop2 = img2.crop(overlap_bbox)
 
-    # Check if any pixels overlap
-    overlap = ImageChops.multiply(crop1, crop2)
-    return overlap.getbbox() is not None
+def _packed_overlap(mask1: np.ndarray, mask2: np.ndarray, overlap_bbox: tuple[int, int, int, int]) -> bool:
+    """Check if two packed masks share a set bit within the given region.
+
+    The region is widened to whole bytes. That can't cause false positives, since a pixel
+    set in both masks always lies inside both bounding boxes.
+    """
+    left, top, right, bottom = overlap_bbox
+    cols = slice(left // 8, (right + 7) // 8)
+    return bool(np.bitwise_and(mask1[top:bottom, cols], mask2[top:bottom, cols]).any())
+
+
+def check_overlap(img1: Image.Image, img2: Image.Image) -> bool:
+    """Efficiently check if two images have overlapping white pixels."""
+    # First check bounding boxes for quick rejection
+    overlap_bbox = _overlap_bbox(img1.getbbox(), img2.getbbox())
+    if overlap_bbox is None:
+        return False
+
+    # Only the overlapping region needs to be packed and compared
+    left, top, right, bottom = overlap_bbox
+    crop1 = pack_mask(img1.crop(overlap_bbox))
+    crop2 = pack_mask(img2.crop(overlap_bbox))
+    return _packed_overlap(crop1, crop2, (0, 0, right - left, bottom - top))
 
 
 def create_spatial_grid(images: dict[str, Image.Image], grid_size: int = 10) -> dict[tuple[int, int], list[str]]:
@@ -73,6 +93,10 @@ def build_conflict_graph(
     for filename in images:
         graph.add_node(filename)
 
+    # Pack each image and find its bounding box once, instead of once per checked pair
+    masks = {filename: pack_mask(img) for filename, img in images.items()}
+    bboxes = {filename: img.getbbox() for filename, img in images.items()}
+
     # Check for overlaps
     logger.info("Checking for overlaps between images")
     checked_pairs: set[tuple[str, str]] = set()
@@ -91,10 +115,8 @@ def build_conflict_graph(
                 checked_pairs.add(pair)
 
                 # Check for overlap
-                img1 = images[img1_name]
-                img2 = images[img2_name]
-
-                if check_overlap(img1, img2):
+                overlap_bbox = _overlap_bbox(bboxes[img1_name], bboxes[img2_name])
+                if overlap_bbox is not None and _packed_overlap(masks[img1_name], masks[img2_name], overlap_bbox):
                     graph.add_edge(img1_name, img2_name)
                     overlap_count += 1
 
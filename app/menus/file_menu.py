@@ -7,8 +7,6 @@ from pathlib import Path
 from tkinter import filedialog, messagebox
 
 from app.component import Component
-from app.gen_print_file import new_print_file
-from app.image_ops import get_component_dimensions
 from app.menus.menu import Menu
 from app.popup import Popup
 
@@ -44,6 +42,9 @@ class FileMenu(Menu):
 
     def load_component(self) -> None:
         """Prompt user to select a component zip and store its dimensions."""
+        # Imported on use: image_ops pulls in scipy, which most sessions never need at startup
+        from app.image_ops import get_component_dimensions  # noqa: PLC0415
+
         file_path = filedialog.askopenfilename(title="Select component zip file", filetypes=[("Zip", "*.zip")])
         if not file_path:
             return
@@ -124,7 +125,7 @@ class FileMenu(Menu):
             component.set_color(self.app.colors[group])
             self.app.groups[group].append(component)
 
-        self.app.group_menu.build_menu()
+        self.app.group_menu.groups_changed()
 
     def check_component_overlap(self) -> set[Component]:
         """Check if any components overlap.
@@ -137,32 +138,30 @@ class FileMenu(Menu):
         """
         overlapping_components = set()
 
-        # Get all components in a flat list
+        # Get all components in a flat list, with their edges computed once up front
         all_components = [comp for group in self.app.groups.values() for comp in group]
+        width = self.app.comp_width
+        height = self.app.comp_height
+        edges = [(comp.x, comp.y, comp.x + width, comp.y + height) for comp in all_components]
 
         # Start with each component
-        for i, c1 in enumerate(all_components):
-            c1_left = c1.x
-            c1_right = c1_left + self.app.comp_width
-            c1_top = c1.y
-            c1_bottom = c1_top + self.app.comp_height
-
+        for i, (c1_left, c1_top, c1_right, c1_bottom) in enumerate(edges):
             # Check against all remaining components (only check forward to avoid duplicate comparisons)
-            for c2 in all_components[i + 1 :]:
-                c2_left = c2.x
-                c2_right = c2_left + self.app.comp_width
-                c2_top = c2.y
-                c2_bottom = c2_top + self.app.comp_height
+            for j in range(i + 1, len(edges)):
+                c2_left, c2_top, c2_right, c2_bottom = edges[j]
 
                 # For top-down coordinates (y increases downward in image coordinates):
                 if c1_left < c2_right and c1_right > c2_left and c1_top < c2_bottom and c1_bottom > c2_top:
-                    overlapping_components.add(c1)
-                    overlapping_components.add(c2)
+                    overlapping_components.add(all_components[i])
+                    overlapping_components.add(all_components[j])
 
         return overlapping_components
 
     def generate_print_file(self) -> None:
         """Generate a new print file with scaled exposure settings and composite images."""
+        # Imported on use: print file generation pulls in the exposure optimizer and networkx
+        from app.gen_print_file import new_print_file  # noqa: PLC0415
+
         # Check if a component has been loaded
         if not self.app.component_file:
             logger.error("No component file loaded")
@@ -33,12 +33,17 @@ class GroupMenu(Menu):
             The Tkinter menubar to which the Group menu is added.
 
         """
+        # Color boxes keyed by color, so groups sharing a color share one image
+        self._color_box_cache = {}
+        self._menu_dirty = False
         super().__init__(app, menubar)
         self.current_group = tk.StringVar()
 
     def _create_menu(self, menubar: tk.Menu) -> None:
         """Create the group menu items."""
         menubar.add_cascade(label="Group", menu=self.menu)
+        # Group entries are only rebuilt when the menu is actually opened after a change
+        self.menu.configure(postcommand=self._rebuild_if_changed)
         self.build_menu()
 
     def _bind_shortcuts(self) -> None:
@@ -113,11 +118,15 @@ class GroupMenu(Menu):
         self.menu.add_command(label="Delete Group", command=self.delete_group)
         self.menu.add_separator()
         self.menu.add_command(label="- Groups -", state=tk.DISABLED)
+        wanted = {group: self.app.colors[group] for group in self.app.groups}
+        for color in self._color_box_cache.keys() - set(wanted.values()):
+            del self._color_box_cache[color]
         self.app.color_boxes.clear()
-        for group in self.app.groups:
-            color = self.app.colors[group]
+        for group, color in wanted.items():
             label = f"  {group}"
-            color_box = self.create_color_box(color)
+            color_box = self._color_box_cache.get(color)
+            if color_box is None:
+                color_box = self._color_box_cache[color] = self.create_color_box(color)
             self.app.color_boxes[group] = color_box
             self.menu.add_radiobutton(
                 label=label,
@@ -134,9 +143,19 @@ class GroupMenu(Menu):
             command=self.change_group,
             accelerator="Ctrl+C",
         )
+
+    def groups_changed(self) -> None:
+        """Select the newest group and mark the menu for rebuilding the next time it is opened."""
+        self._menu_dirty = True
         if self.app.groups:
             self.current_group.set(list(self.app.groups.keys())[-1])
 
+    def _rebuild_if_changed(self) -> None:
+        """Rebuild the menu entries if groups changed since they were last built."""
+        if self._menu_dirty:
+            self._menu_dirty = False
+            self.build_menu()
+
     def new_group(self) -> None:
         """Create a new group."""
         group_name = self._prompt_group_name("New Group")
@@ -152,7 +171,7 @@ class GroupMenu(Menu):
             simpledialog.messagebox.showerror("Error", "Please select a color for the new group.")
             return
         self.app.groups[group_name] = []
-        self.build_menu()
+        self.groups_changed()
 
     def delete_group(self) -> None:
         """Delete the currently selected group and its components."""
@@ -168,9 +187,8 @@ class GroupMenu(Menu):
                 comp.delete()
             del self.app.groups[group]
             del self.app.colors[group]
-            self.build_menu()
             self.app.deselect_all()
-            self.build_menu()
+            self.groups_changed()
 
     def rename_group(self) -> None:
         """Rename the currently selected group."""
@@ -189,7 +207,7 @@ class GroupMenu(Menu):
         self.app.colors[new_name] = self.app.colors.pop(old_name)
         for comp in self.app.groups[new_name]:
             comp.group = new_name
-        self.build_menu()
+        self.groups_changed()
         self.current_group.set(new_name)
         self.app.update_label(self.app.selection[0])
 
@@ -204,7 +222,7 @@ class GroupMenu(Menu):
         self.app.colors[group] = color
         for comp in self.app.groups.get(group, []):
             comp.set_color(color)
-        self.build_menu()
+        self.groups_changed()
 
     def change_group(self) -> None:
         """Change the group of the selected components to the current group."""
@@ -1,6 +1,5 @@
 """Shared utilities for loading and saving print files."""
 
-import io
 import json
 import logging
 import zipfile
@@ -59,6 +58,84 @@ def collect_referenced_images(print_settings: dict[str, Any]) -> set[str]:
     return referenced_images
 
 
+def check_print_file_path(input_path: Path) -> None:
+    """Raise a ValueError if a print file path is not a zip file.
+
+    Parameters
+    ----------
+    input_path : Path
+        Path to the print file.
+
+    """
+    if input_path.suffix.lower() != ".zip":
+        msg = "Input path must be a .zip file."
+        logger.error(msg)
+        raise ValueError(msg)
+
+
+def read_print_settings(zf: zipfile.ZipFile) -> dict[str, Any]:
+    """Read the print settings from an open print file.
+
+    Parameters
+    ----------
+    zf : zipfile.ZipFile
+        The print file opened for reading.
+
+    Returns
+    -------
+    dict[str, Any]
+        The parsed print_settings.json.
+
+    """
+    logger.debug("Reading print_settings.json from zip")
+    with zf.open("print_settings.json") as f:
+        return json.load(f)
+
+
+def read_slice(zf: zipfile.ZipFile, img_name: str) -> Image.Image:
+    """Decode a single slice image from an open print file.
+
+    Parameters
+    ----------
+    zf : zipfile.ZipFile
+        The print file opened for reading.
+    img_name : str
+        The image filename, relative to the slices folder.
+
+    Returns
+    -------
+    Image.Image
+        The slice as an "L" mode image.
+
+    """
+    with zf.open(f"slices/{img_name}") as f:
+        logger.debug("Loading image: %s", img_name)
+        img = Image.open(f)
+        img.load()
+    # Slices are normally grayscale already; converting those would only make a copy
+    return img if img.mode == "L" else img.convert("L")
+
+
+def write_slice(zf: zipfile.ZipFile, img_name: str, img: Image.Image, compress_level: int = 6) -> None:
+    """Encode a single slice image as PNG straight into an open print file.
+
+    Parameters
+    ----------
+    zf : zipfile.ZipFile
+        The print file opened for writing.
+    img_name : str
+        The image filename, relative to the slices folder.
+    img : Image.Image
+        The image to save.
+    compress_level : int, optional
+        The PNG zlib compression level, by default 6.
+
+    """
+    logger.debug("Saving image: %s", img_name)
+    with zf.open(f"slices/{img_name}", "w") as f:
+        img.save(f, format="PNG", compress_level=compress_level)
+
+
 def load_print_file(input_path: Path) -> tuple[dict[str, Any], dict[str, Image.Image]]:
     """Load print settings and images from a zip file.
 
@@ -76,16 +153,11 @@ def load_print_file(input_path: Path) -> tuple[dict[str, Any], dict[str, Image.I
 
     """
     logger.info("Loading print file from %s", input_path)
-    if input_path.suffix.lower() != ".zip":
-        msg = "Input path must be a .zip file."
-        logger.error(msg)
-        raise ValueError(msg)
+    check_print_file_path(input_path)
 
     images: dict[str, Image.Image] = {}
     with zipfile.ZipFile(input_path, "r") as zf:
-        logger.debug("Reading print_settings.json from zip")
-        with zf.open("print_settings.json") as f:
-            print_settings = json.load(f)
+        print_settings = read_print_settings(zf)
 
         # Collect unique image names to avoid reloading same file every time it is referenced
         unique_images = set()
@@ -98,9 +170,7 @@ def load_print_file(input_path: Path) -> tuple[dict[str, Any], dict[str, Image.I
         # Load all images
         for img_name in unique_images:
             try:
-                with zf.open(f"slices/{img_name}") as f:
-                    logger.debug("Loading image: %s", img_name)
-                    images[img_name] = Image.open(f).convert("L")
+                images[img_name] = read_slice(zf, img_name)
             except (KeyError, OSError):
                 logger.exception("Failed to load image %s", img_name)
                 raise
@@ -128,9 +198,6 @@ def save_print_file(output_path: Path, print_settings: dict[str, Any], images: d
         # Save all images
         logger.info("Saving %d images", len(images))
         for img_name, img in images.items():
-            logger.debug("Saving image: %s", img_name)
-            img_bytes = io.BytesIO()
-            img.save(img_bytes, format="PNG")
-            zf.writestr(f"slices/{img_name}", img_bytes.getvalue())
+            write_slice(zf, img_name, img)
 
     logger.info("Print file saved successfully")
@@ -4,7 +4,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from app.app import App
+from app.app import DRAG_REDRAW_INTERVAL_MS, App
 from app.component import Component
 from app.constants import CANVAS_HEIGHT, CANVAS_WIDTH
 
@@ -75,6 +75,7 @@ def test_app_initialization(app: App) -> None:
     assert app.selection_rect is None
     assert app.selection_start_x is None
     assert app.selection_start_y is None
+    assert app.component_clicked is False
     assert app.zoom_factor == 1.0
 
 
@@ -168,6 +169,103 @@ def test_component_dragging(app: App) -> None:
     assert comp.y == 60
 
 
+def test_canvas_click_empty_area(app: App) -> None:
+    """Test that clicking empty canvas deselects everything and starts a drag-selection."""
+    app.canvas.canvasx = MagicMock(side_effect=lambda x: x)
+    app.canvas.canvasy = MagicMock(side_effect=lambda y: y)
+    app.groups["1.0"] = []
+    app.colors["1.0"] = "#FF0000"
+    comp = Component(app, 50, 50, "1.0")
+    comp.select()
+
+    event = MagicMock()
+    event.x = 500
+    event.y = 400
+    app.on_canvas_click(event)
+
+    assert app.selection == []
+    assert (app.selection_start_x, app.selection_start_y) == (500, 400)
+    app.canvas.find_withtag.assert_not_called()
+
+
+def test_canvas_click_on_component(app: App) -> None:
+    """Test that a click handled by a component does not start a drag-selection."""
+    app.canvas.canvasx = MagicMock(side_effect=lambda x: x)
+    app.canvas.canvasy = MagicMock(side_effect=lambda y: y)
+    app.groups["1.0"] = []
+    app.colors["1.0"] = "#FF0000"
+    comp = Component(app, 50, 50, "1.0")
+
+    # Tk runs the item binding first, then the canvas binding
+    event = MagicMock()
+    event.x = 60
+    event.y = 60
+    event.state = 0
+    comp.on_click(event)
+    app.on_canvas_click(event)
+
+    assert app.selection == [comp]
+    assert app.selection_start_x is None
+    assert app.selection_start_y is None
+    assert app.component_clicked is False
+
+
+def test_drag_selection_rectangle(app: App) -> None:
+    """Test that drag events are coalesced and the selection rectangle is created once, then moved."""
+    app.canvas.canvasx = MagicMock(side_effect=lambda x: x)
+    app.canvas.canvasy = MagicMock(side_effect=lambda y: y)
+    app.canvas.create_rectangle.reset_mock()
+    app.root.after = MagicMock(return_value="after#1")
+    app.selection_start_x = 10
+    app.selection_start_y = 20
+
+    def drag(*positions: int) -> None:
+        for pos in positions:
+            event = MagicMock()
+            event.x = pos
+            event.y = pos
+            app.on_canvas_drag(event)
+
+    # Several motion events schedule a single redraw at the latest position
+    drag(30, 40, 50)
+    app.root.after.assert_called_once_with(DRAG_REDRAW_INTERVAL_MS, app._flush_drag)  # noqa: SLF001
+    app.canvas.create_rectangle.assert_not_called()
+    app._flush_drag()  # noqa: SLF001
+    app.canvas.create_rectangle.assert_called_once_with(10, 20, 50, 50, outline="blue", dash=(2, 2))
+
+    drag(60, 70)
+    app._flush_drag()  # noqa: SLF001
+    app.canvas.create_rectangle.assert_called_once()
+    app.canvas.delete.assert_not_called()
+    app.canvas.coords.assert_called_with(app.selection_rect, 10, 20, 70, 70)
+
+
+def test_release_flushes_pending_drag(app: App) -> None:
+    """Test that releasing the mouse applies the final drag position before selecting."""
+    app.canvas.canvasx = MagicMock(side_effect=lambda x: x)
+    app.canvas.canvasy = MagicMock(side_effect=lambda y: y)
+    app.root.after = MagicMock(return_value="after#1")
+    app.root.after_cancel = MagicMock()
+    app.selection_start_x = 0
+    app.selection_start_y = 0
+
+    event = MagicMock()
+    event.x = 200
+    event.y = 200
+    app.on_canvas_drag(event)
+
+    with (
+        patch.object(app.canvas, "coords", return_value=[0, 0, 200, 200]),
+        patch.object(app, "select_components_in_area") as mock_select,
+    ):
+        app.on_canvas_release(event)
+
+    app.canvas.create_rectangle.assert_called_with(0, 0, 200, 200, outline="blue", dash=(2, 2))
+    app.root.after_cancel.assert_called_once_with("after#1")
+    mock_select.assert_called_once_with(0, 0, 200, 200)
+    assert app.selection_rect is None
+
+
 def test_select_components_in_area(app: App) -> None:
     """Test area selection of components."""
     # Setup test components
@@ -194,6 +292,41 @@ def test_select_components_in_area(app: App) -> None:
     assert comp2 not in app.selection
 
 
+def test_select_components_in_area_many(app: App) -> None:
+    """Test area selection over a grid of components."""
+    app.groups["1.0"] = []
+    app.colors["1.0"] = "#FF0000"
+    for i in range(10):
+        for j in range(5):
+            app.groups["1.0"].append(Component(app, i * 150, j * 150, "1.0"))
+
+    # Covers the first two columns and rows, plus part of the third
+    app.select_components_in_area(390, 390, 0, 0)
+
+    selected = sorted(comp.to_dict() for comp in app.selection)
+    assert selected == [(0, 0), (0, 150), (150, 0), (150, 150)]
+
+
+def test_component_bbox_index(app: App) -> None:
+    """Test that moving and deleting components keeps the selection arrays in sync."""
+    app.groups["1.0"] = []
+    app.colors["1.0"] = "#FF0000"
+    comps = [Component(app, i * 200, 0, "1.0") for i in range(100)]
+
+    comps[0].set_position(1000, 1000)
+    comps[1].delete()
+    app.select_components_in_area(0, 0, 2000, 2000)
+    assert comps[0] in app.selection
+    assert comps[1] not in app.selection
+    assert comps[2] in app.selection
+    assert comps[-1] not in app.selection  # x = 19800, outside the area
+
+    app.deselect_all()
+    comps[-1].set_position(500, 500)
+    app.select_components_in_area(400, 400, 700, 700)
+    assert app.selection == [comps[-1]]
+
+
 def test_clear_canvas(app: App) -> None:
     """Test canvas clearing functionality."""
     # Setup test components
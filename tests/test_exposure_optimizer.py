@@ -4,17 +4,21 @@ import json
 import zipfile
 from pathlib import Path
 from typing import Any
+from unittest.mock import patch
 
+import numpy as np
 import pytest
 from PIL import Image, ImageChops
 
 from app.constants import CANVAS_HEIGHT, CANVAS_WIDTH
 from app.exposure_optimizer import (
+    _partition_exposures,
     group_by_settings,
     optimize_layer,
     optimize_print_file,
     optimize_print_settings,
 )
+from app.print_file_utils import read_slice, write_slice
 
 
 @pytest.fixture
@@ -61,24 +65,35 @@ def sample_images() -> dict[str, Image.Image]:
         - image3.png: White square overlapping with image1 (50, 50, 150, 150)
 
     """
-    images = {}
+    names = ("image1.png", "image2.png", "image3.png")
+    arrays = {name: np.zeros((CANVAS_HEIGHT, CANVAS_WIDTH), dtype=np.uint8) for name in names}
 
     # Create non-overlapping images
-    img1 = Image.new("L", (CANVAS_WIDTH, CANVAS_HEIGHT), color=0)
-    img1.paste(255, (0, 0, 100, 100))  # White square in top-left
-
-    img2 = Image.new("L", (CANVAS_WIDTH, CANVAS_HEIGHT), color=0)
-    img2.paste(255, (200, 200, 300, 300))  # White square in middle
+    arrays["image1.png"][0:100, 0:100] = 255  # White square in top-left
+    arrays["image2.png"][200:300, 200:300] = 255  # White square in middle
 
     # Create overlapping image
-    img3 = Image.new("L", (CANVAS_WIDTH, CANVAS_HEIGHT), color=0)
-    img3.paste(255, (50, 50, 150, 150))  # Overlaps with img1
+    arrays["image3.png"][50:150, 50:150] = 255  # Overlaps with img1
+
+    return {name: Image.fromarray(arr, "L") for name, arr in arrays.items()}
 
-    images["image1.png"] = img1
-    images["image2.png"] = img2
-    images["image3.png"] = img3
 
-    return images
+def _layer(first: str, second: str) -> dict[str, Any]:
+    """Build a layer exposing two images for the same time with the same settings."""
+    return {
+        "Image settings list": [
+            {"Image file": first, "Layer exposure time (ms)": 1000, "Other setting": "value1"},
+            {"Image file": second, "Layer exposure time (ms)": 1000, "Other setting": "value1"},
+        ],
+    }
+
+
+def _write_print_file(zip_path: Path, settings: dict[str, Any], images: dict[str, Image.Image]) -> None:
+    """Write a print file zip with the given settings and slice images."""
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr("print_settings.json", json.dumps(settings))
+        for name, img in images.items():
+            write_slice(zf, name, img)
 
 
 def test_group_by_settings_empty_list() -> None:
@@ -105,6 +120,16 @@ def test_group_by_settings_identical_settings() -> None:
     assert len(next(iter(groups.values()))) == 2
 
 
+def test_group_by_settings_different_settings(sample_image_settings: list[dict[str, Any]]) -> None:
+    """Test that images differing in any other setting land in separate groups, regardless of key order."""
+    reordered = {"Other setting": "value1", "Layer exposure time (ms)": 500, "Image file": "a.png"}
+    settings = [*sample_image_settings, reordered]
+    groups = group_by_settings(settings)
+    assert len(groups) == 2
+    assert groups[(("Other setting", "value1"),)] == [settings[0], settings[1], settings[3]]
+    assert groups[(("Other setting", "value2"),)] == [settings[2]]
+
+
 def test_optimize_layer_empty_list() -> None:
     """Test layer optimization with empty input list."""
     settings = []
@@ -151,6 +176,26 @@ def test_optimize_layer_identical_exposures(sample_images: dict[str, Image.Image
     assert any("_opt_" in name for name in new_images)
 
 
+def test_optimize_layer_non_canvas_size() -> None:
+    """Test that composites take the size of the input images rather than the canvas."""
+    arrays = [np.zeros((100, 100), dtype=np.uint8) for _ in range(2)]
+    arrays[0][:50, :50] = 255
+    arrays[1][60:, 60:] = 255
+    images = {"a.png": Image.fromarray(arrays[0], "L"), "b.png": Image.fromarray(arrays[1], "L")}
+    settings = [
+        {"Image file": "a.png", "Layer exposure time (ms)": 1000},
+        {"Image file": "b.png", "Layer exposure time (ms)": 2000},
+    ]
+
+    optimized_settings, new_images = optimize_layer(settings, images)
+
+    assert [s["Layer exposure time (ms)"] for s in optimized_settings] == [1000, 1000]
+    first, second = (new_images[s["Image file"]] for s in optimized_settings)
+    assert first.size == second.size == (100, 100)
+    assert ImageChops.difference(first, ImageChops.lighter(images["a.png"], images["b.png"])).getbbox() is None
+    assert ImageChops.difference(second, images["b.png"]).getbbox() is None
+
+
 def test_optimize_print_file_empty_layers() -> None:
     """Test print file optimization with empty layers list."""
     print_settings = {"Layers": []}
@@ -170,9 +215,7 @@ def test_optimize_print_file_empty_settings_list() -> None:
 def test_optimize_print_file_missing_slices(tmp_path: Path) -> None:
     """Test handling of missing slices directory in zip."""
     zip_path = tmp_path / "test.zip"
-    with zipfile.ZipFile(zip_path, "w") as zf:
-        settings = {"Layers": [{"Image settings list": []}]}
-        zf.writestr("print_settings.json", json.dumps(settings))
+    _write_print_file(zip_path, {"Layers": [{"Image settings list": []}]}, {})
 
     output_path = zip_path.parent / f"{zip_path.stem}_optimized.zip"
     optimize_print_file(zip_path)
@@ -192,14 +235,64 @@ def test_optimize_print_file_invalid_json(tmp_path: Path) -> None:
         optimize_print_file(zip_path)
 
 
+def test_optimize_print_file_not_zip(tmp_path: Path) -> None:
+    """Test that a print file path without a .zip suffix is rejected."""
+    with pytest.raises(ValueError, match=r"must be a \.zip file"):
+        optimize_print_file(tmp_path / "test.txt")
+
+
+def test_optimize_print_file_keeps_default_image(tmp_path: Path, sample_images: dict[str, Image.Image]) -> None:
+    """Test that the default layer image is written even when every layer now uses a composite."""
+    zip_path = tmp_path / "test.zip"
+    settings = {
+        "Default layer settings": {"Image settings": {"Image file": "image1.png"}},
+        "Layers": [_layer("image1.png", "image2.png")],
+    }
+    _write_print_file(zip_path, settings, sample_images)
+
+    optimize_print_file(zip_path)
+
+    with zipfile.ZipFile(tmp_path / "test_optimized.zip", "r") as zf:
+        settings = json.loads(zf.read("print_settings.json"))
+        assert settings["Default layer settings"]["Image settings"]["Image file"] == "image1.png"
+        assert "slices/image1.png" in zf.namelist()
+        assert "slices/image2.png" not in zf.namelist()
+        assert ImageChops.difference(read_slice(zf, "image1.png"), sample_images["image1.png"]).getbbox() is None
+
+
+def test_optimize_print_file_in_place(tmp_path: Path, sample_images: dict[str, Image.Image]) -> None:
+    """Test that a print file can be optimized onto itself without truncating it mid-read."""
+    zip_path = tmp_path / "test.zip"
+    _write_print_file(zip_path, {"Layers": [_layer("image1.png", "image2.png")]}, sample_images)
+
+    optimize_print_file(zip_path, zip_path)
+
+    assert [p.name for p in tmp_path.iterdir()] == ["test.zip"]
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        layer = json.loads(zf.read("print_settings.json"))["Layers"][0]["Image settings list"]
+        assert len(layer) == 1
+        expected = ImageChops.lighter(sample_images["image1.png"], sample_images["image2.png"])
+        assert ImageChops.difference(read_slice(zf, layer[0]["Image file"]), expected).getbbox() is None
+
+
+def test_optimize_print_file_failure_leaves_no_output(tmp_path: Path, sample_images: dict[str, Image.Image]) -> None:
+    """Test that a failure partway through writes neither the output nor a leftover temporary file."""
+    zip_path = tmp_path / "test.zip"
+    settings = {"Layers": [_layer("image1.png", "image2.png"), _layer("image3.png", "missing.png")]}
+    _write_print_file(zip_path, settings, sample_images)
+
+    with pytest.raises(KeyError):
+        optimize_print_file(zip_path)
+
+    assert [p.name for p in tmp_path.iterdir()] == ["test.zip"]
+
+
 def test_optimize_print_file_custom_output(tmp_path: Path) -> None:
     """Test optimization with custom output path."""
     zip_path = tmp_path / "test.zip"
     output_path = tmp_path / "custom_output.zip"
 
-    with zipfile.ZipFile(zip_path, "w") as zf:
-        settings = {"Layers": [{"Image settings list": []}]}
-        zf.writestr("print_settings.json", json.dumps(settings))
+    _write_print_file(zip_path, {"Layers": [{"Image settings list": []}]}, {})
 
     optimize_print_file(zip_path, output_path)
     assert output_path.exists()
@@ -259,6 +352,25 @@ def test_optimize_layer_overlapping_images(sample_images: dict[str, Image.Image]
         assert "_opt_" in setting["Image file"]
 
 
+def test_optimize_layer_skips_partitioning_without_overlap(sample_images: dict[str, Image.Image]) -> None:
+    """Test that graph coloring only runs for groups whose images overlap."""
+    settings = [
+        {"Image file": "image1.png", "Layer exposure time (ms)": 1000, "Other setting": "value1"},
+        {"Image file": "image2.png", "Layer exposure time (ms)": 1000, "Other setting": "value1"},
+    ]
+    with patch("app.exposure_optimizer.partition_images") as mock_partition:
+        optimized_settings, new_images = optimize_layer(settings, sample_images)
+    mock_partition.assert_not_called()
+    assert len(optimized_settings) == 1
+    expected = ImageChops.lighter(sample_images["image1.png"], sample_images["image2.png"])
+    assert ImageChops.difference(new_images[optimized_settings[0]["Image file"]], expected).getbbox() is None
+
+    settings[1]["Image file"] = "image3.png"
+    with patch("app.exposure_optimizer.partition_images", return_value={0: ["image1.png"], 1: ["image3.png"]}) as mock:
+        optimize_layer(settings, sample_images)
+    mock.assert_called_once()
+
+
 def test_optimize_layer_progressive_exposures(sample_images: dict[str, Image.Image]) -> None:
     """Test optimization with progressive exposure times."""
     # Only use image1 and image2 for this test
@@ -290,3 +402,194 @@ def test_optimize_layer_progressive_exposures(sample_images: dict[str, Image.Ima
     second_img = new_images[second["Image file"]]
     # The second image should be just image2 since it needs more exposure
     assert ImageChops.difference(second_img, test_images["image2.png"]).getbbox() is None
+
+
+def test_partition_exposures_steps(sample_images: dict[str, Image.Image]) -> None:
+    """Test that each exposure step composites all images with at least that exposure."""
+    stack = [np.asarray(sample_images[name]) for name in ("image1.png", "image2.png", "image3.png")]
+    times = np.array([1000, 1000, 2500], dtype=np.int64)
+
+    composites, exposure_diffs, step_indices = _partition_exposures(stack, times)
+
+    assert step_indices.tolist() == [0, 2]
+    assert exposure_diffs.tolist() == [1000, 1500]
+    np.testing.assert_array_equal(composites[0], np.maximum.reduce(stack))
+    np.testing.assert_array_equal(composites[1], stack[2])
+
+
+def test_partition_exposures_skips_empty_steps(empty_image: Image.Image) -> None:
+    """Test that steps with zero added exposure or no pixels are dropped."""
+    stack = [np.asarray(empty_image), np.asarray(empty_image)]
+    times = np.array([0, 1000], dtype=np.int64)
+
+    composites, exposure_diffs, step_indices = _partition_exposures(stack, times)
+
+    assert composites.shape == (0, CANVAS_HEIGHT, CANVAS_WIDTH)
+    assert exposure_diffs.tolist() == []
+    assert step_indices.tolist() == []
+
+
+def test_optimize_print_file_with_images(tmp_path: Path, sample_images: dict[str, Image.Image]) -> None:
+    """Test that layers are optimized and only referenced images are written to the output."""
+    zip_path = tmp_path / "test.zip"
+    settings = {
+        "Layers": [
+            {
+                "Image settings list": [
+                    {"Image file": "image1.png", "Layer exposure time (ms)": 1000, "Other setting": "value1"},
+                    {"Image file": "image2.png", "Layer exposure time (ms)": 1000, "Other setting": "value1"},
+                ],
+            },
+            {
+                "Image settings list": [
+                    {"Image file": "image3.png", "Layer exposure time (ms)": 1000, "Other setting": "value1"},
+                ],
+            },
+        ],
+    }
+    _write_print_file(zip_path, settings, sample_images)
+
+    output_path = tmp_path / "out.zip"
+    optimize_print_file(zip_path, output_path)
+
+    with zipfile.ZipFile(output_path, "r") as zf:
+        result = json.loads(zf.read("print_settings.json"))
+        first_layer, second_layer = (layer["Image settings list"] for layer in result["Layers"])
+        assert len(first_layer) == 1
+        combined_name = first_layer[0]["Image file"]
+        assert "_opt_" in combined_name
+        assert second_layer == settings["Layers"][1]["Image settings list"]
+
+        assert sorted(zf.namelist()) == sorted(
+            ["print_settings.json", "slices/", f"slices/{combined_name}", "slices/image3.png"],
+        )
+        with zf.open(f"slices/{combined_name}") as f:
+            combined_img = Image.open(f).convert("L")
+        expected = ImageChops.lighter(sample_images["image1.png"], sample_images["image2.png"])
+        assert ImageChops.difference(combined_img, expected).getbbox() is None
+
+
+def test_optimize_print_settings_parallel_matches_serial(sample_images: dict[str, Image.Image]) -> None:
+    """Test that optimizing layers in worker processes gives the same result as in-process."""
+    layer = [
+        {"Image file": "image1.png", "Layer exposure time (ms)": 1000, "Other setting": "value1"},
+        {"Image file": "image2.png", "Layer exposure time (ms)": 2000, "Other setting": "value1"},
+    ]
+    print_settings = {"Layers": [{"Image settings list": list(layer) if i % 2 else []} for i in range(6)]}
+
+    serial_settings, serial_images = optimize_print_settings(print_settings, sample_images, jobs=1)
+    with patch("app.exposure_optimizer.os.cpu_count", return_value=2):
+        parallel_settings, parallel_images = optimize_print_settings(print_settings, sample_images, jobs=2)
+
+    assert parallel_settings == serial_settings
+    assert parallel_images.keys() == serial_images.keys()
+    for name, img in serial_images.items():
+        assert ImageChops.difference(parallel_images[name], img).getbbox() is None
+
+
+def test_optimize_print_settings_parallel_keeps_image_mode(sample_images: dict[str, Image.Image]) -> None:
+    """Test that images other than "L" reach worker processes with their own mode."""
+    images = {name: img.convert("I;16") for name, img in sample_images.items()}
+    print_settings = {"Layers": [_layer("image1.png", "image2.png")]}
+
+    serial_settings, serial_images = optimize_print_settings(print_settings, images, jobs=1)
+    with patch("app.exposure_optimizer.os.cpu_count", return_value=2):
+        parallel_settings, parallel_images = optimize_print_settings(print_settings, images, jobs=2)
+
+    assert parallel_settings == serial_settings
+    name = serial_settings["Layers"][0]["Image settings list"][0]["Image file"]
+    assert ImageChops.difference(parallel_images[name], serial_images[name]).getbbox() is None
+
+
+def test_optimize_print_settings_reuses_identical_composites(sample_images: dict[str, Image.Image]) -> None:
+    """Test that layers producing identical composites share a single image."""
+    images = {
+        **sample_images,
+        "copy1.png": sample_images["image1.png"].copy(),
+        "copy2.png": sample_images["image2.png"].copy(),
+    }
+
+    print_settings = {"Layers": [_layer("image1.png", "image2.png"), _layer("copy1.png", "copy2.png")]}
+    result_settings, result_images = optimize_print_settings(print_settings, images)
+
+    first_layer, second_layer = (layer["Image settings list"] for layer in result_settings["Layers"])
+    assert first_layer[0]["Image file"] == "image1_opt_0.png"
+    assert second_layer[0]["Image file"] == "image1_opt_0.png"
+    assert "copy1_opt_0.png" not in result_images
+
+
+@pytest.fixture
+def clashing_layers(sample_images: dict[str, Image.Image]) -> tuple[dict[str, Any], dict[str, Image.Image]]:
+    """Create layers a+b, a+c and d+e, where d and e are copies of a and b.
+
+    Returns
+    -------
+    tuple[dict[str, Any], dict[str, Image.Image]]
+        Print settings and the images they reference. The first two layers both produce a
+        composite named a_opt_0.png, with different pixels.
+
+    """
+    c = np.zeros((CANVAS_HEIGHT, CANVAS_WIDTH), dtype=np.uint8)
+    c[400:500, 400:500] = 255
+    images = {
+        "a.png": sample_images["image1.png"],
+        "b.png": sample_images["image2.png"],
+        "c.png": Image.fromarray(c, "L"),
+        "d.png": sample_images["image1.png"].copy(),
+        "e.png": sample_images["image2.png"].copy(),
+    }
+
+    print_settings = {"Layers": [_layer("a.png", "b.png"), _layer("a.png", "c.png"), _layer("d.png", "e.png")]}
+    return print_settings, images
+
+
+def test_optimize_print_settings_clashing_composite_names(
+    clashing_layers: tuple[dict[str, Any], dict[str, Image.Image]],
+) -> None:
+    """Test that a composite name reused with new pixels neither replaces nor aliases the earlier image."""
+    print_settings, images = clashing_layers
+    result_settings, result_images = optimize_print_settings(print_settings, images)
+
+    names = [layer["Image settings list"][0]["Image file"] for layer in result_settings["Layers"]]
+    assert names[0] == names[2] == "a_opt_0.png"
+    assert names[1] != names[0]
+    pairs = [("a.png", "b.png"), ("a.png", "c.png"), ("d.png", "e.png")]
+    for name, (first, second) in zip(names, pairs, strict=True):
+        expected = ImageChops.lighter(images[first], images[second])
+        assert ImageChops.difference(result_images[name], expected).getbbox() is None
+
+
+def test_optimize_print_file_clashing_composite_names(
+    tmp_path: Path,
+    clashing_layers: tuple[dict[str, Any], dict[str, Image.Image]],
+) -> None:
+    """Test that every streamed layer references a slice with its own composite."""
+    print_settings, images = clashing_layers
+    zip_path = tmp_path / "test.zip"
+    _write_print_file(zip_path, print_settings, images)
+
+    optimize_print_file(zip_path)
+
+    with zipfile.ZipFile(tmp_path / "test_optimized.zip", "r") as zf:
+        layers = json.loads(zf.read("print_settings.json"))["Layers"]
+        pairs = [("a.png", "b.png"), ("a.png", "c.png"), ("d.png", "e.png")]
+        for layer, (first, second) in zip(layers, pairs, strict=True):
+            img = read_slice(zf, layer["Image settings list"][0]["Image file"])
+            expected = ImageChops.lighter(images[first], images[second])
+            assert ImageChops.difference(img, expected).getbbox() is None
+
+
+def test_optimize_print_file_decodes_shared_slices_once(tmp_path: Path, sample_images: dict[str, Image.Image]) -> None:
+    """Test that a slice referenced by several layers is only decoded once."""
+    zip_path = tmp_path / "test.zip"
+    settings = {"Layers": [_layer("image1.png", "image2.png") for _ in range(3)]}
+    images = {name: sample_images[name] for name in ("image1.png", "image2.png")}
+    _write_print_file(zip_path, settings, images)
+
+    with patch("app.exposure_optimizer.read_slice", wraps=read_slice) as mock_read:
+        optimize_print_file(zip_path, tmp_path / "out.zip")
+
+    assert sorted(call.args[1] for call in mock_read.call_args_list) == ["image1.png", "image2.png"]
+    with zipfile.ZipFile(tmp_path / "out.zip", "r") as zf:
+        result = json.loads(zf.read("print_settings.json"))
+    assert all(len(layer["Image settings list"]) == 1 for layer in result["Layers"])
@@ -83,7 +83,7 @@ def test_load_component_success(file_menu: FileMenu) -> None:
 
     with (
         patch("tkinter.filedialog.askopenfilename", return_value=mock_file_path),
-        patch("app.menus.file_menu.get_component_dimensions", return_value=(200, 150)),
+        patch("app.image_ops.get_component_dimensions", return_value=(200, 150)),
         patch("tkinter.messagebox.showinfo"),
     ):
         file_menu.load_component()
@@ -264,6 +264,19 @@ def test_check_component_overlap(file_menu: FileMenu) -> None:
     assert mock_comp3 not in overlaps
 
 
+def test_check_component_overlap_touching_edges(file_menu: FileMenu) -> None:
+    """Test that components sharing an edge are not reported as overlapping."""
+    comps = []
+    for x in (0, 100, 200):
+        comp = MagicMock()
+        comp.x = x
+        comp.y = 0
+        comps.append(comp)
+    file_menu.app.groups = {"Group1": comps}
+
+    assert file_menu.check_component_overlap() == set()
+
+
 def test_generate_print_file_success(file_menu: FileMenu) -> None:
     """Test generating print file successfully."""
     # Setup mock data
@@ -272,7 +285,7 @@ def test_generate_print_file_success(file_menu: FileMenu) -> None:
 
     with (
         patch("tkinter.filedialog.asksaveasfilename", return_value="output.json"),
-        patch("app.menus.file_menu.new_print_file") as mock_new_print_file,
+        patch("app.gen_print_file.new_print_file") as mock_new_print_file,
         patch("app.menus.file_menu.Popup") as mock_popup,
     ):
         file_menu.generate_print_file()
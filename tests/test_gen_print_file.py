@@ -6,9 +6,10 @@ import zipfile
 from pathlib import Path
 
 import pytest
-from PIL import Image
+from PIL import Image, ImageChops
 
-from app.gen_print_file import new_print_file
+from app.constants import CANVAS_HEIGHT, CANVAS_WIDTH
+from app.gen_print_file import gen_group_composite, new_print_file
 
 
 @pytest.fixture
@@ -112,3 +113,20 @@ def test_new_print_file_group_scaling(tmp_path: Path, test_component_zip: Path)
         assert (
             expected_exposures == found_exposures
         ), f"Incorrect exposure scaling. Expected {expected_exposures}, found {found_exposures}"
+
+
+def test_gen_group_composite_clips_to_canvas() -> None:
+    """Test that placed copies are merged and clipped at the canvas edges like Image.paste."""
+    base = Image.new("L", (10, 10), 0)
+    base.paste(200, (0, 0, 10, 5))
+    base.paste(100, (0, 5, 10, 10))
+
+    positions = [{"x": 0, "y": 0}, {"x": 5, "y": 5}, {"x": -5, "y": CANVAS_HEIGHT - 5}, {"x": CANVAS_WIDTH, "y": 0}]
+    composite = gen_group_composite(base, positions)
+
+    expected = Image.new("L", (CANVAS_WIDTH, CANVAS_HEIGHT), 0)
+    for pos in positions:
+        placed = Image.new("L", (CANVAS_WIDTH, CANVAS_HEIGHT), 0)
+        placed.paste(base, (pos["x"], pos["y"]))
+        expected = ImageChops.lighter(expected, placed)
+    assert ImageChops.difference(composite, expected).getbbox() is None
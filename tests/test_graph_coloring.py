@@ -90,3 +90,30 @@ def test_partition_overlapping_images() -> None:
     assert len(partitions[1]) == 1
     assert "img1.png" in partitions[0] or "img1.png" in partitions[1]
     assert "img2.png" in partitions[0] or "img2.png" in partitions[1]
+
+
+def test_partition_interleaved_within_byte(empty_image: Image.Image) -> None:
+    """Test that images sharing packed mask bytes but no pixels are not treated as overlapping.
+
+    Parameters
+    ----------
+    empty_image : Image.Image
+        Fixture providing an empty test image.
+
+    """
+    img1 = empty_image.copy()
+    img2 = empty_image.copy()
+
+    # Columns 0-3 and 4-7 fall in the same packed byte, and the bounding boxes overlap
+    img1.paste(255, (0, 0, 4, 30))
+    img1.paste(255, (20, 20, 30, 30))
+    img2.paste(255, (4, 0, 8, 30))
+
+    partitions = partition_images({"img1.png": img1, "img2.png": img2})
+    assert len(partitions) == 1
+    assert sorted(partitions[0]) == ["img1.png", "img2.png"]
+
+    # A single shared pixel inside that byte is an overlap
+    img2.putpixel((3, 29), 255)
+    partitions = partition_images({"img1.png": img1, "img2.png": img2})
+    assert len(partitions) == 2
@@ -38,6 +38,7 @@ def group_menu(mock_app: MagicMock) -> GroupMenu:
 
                 # Replace the build_menu method with a MagicMock to allow assert_not_called
                 menu.build_menu = MagicMock()
+                menu.groups_changed = MagicMock()
 
                 return menu
 
@@ -177,6 +178,41 @@ def test_build_menu(group_menu: GroupMenu) -> None:
         assert menu_mock.add_radiobutton.call_count >= 2
 
 
+def test_build_menu_reuses_color_boxes(group_menu: GroupMenu) -> None:
+    """Test that color boxes are only created for colors that don't already have one."""
+    group_menu.app.groups = {"Group1": [], "Group2": [], "Group3": []}
+    group_menu.app.colors = {"Group1": "red", "Group2": "blue", "Group3": "red"}
+    group_menu.app.color_boxes = {}
+    group_menu.menu = MagicMock()
+
+    with patch.object(GroupMenu, "create_color_box", side_effect=lambda color: f"box-{color}") as mock_create:
+        GroupMenu.build_menu(group_menu)
+        assert sorted(call.args[0] for call in mock_create.call_args_list) == ["blue", "red"]
+        assert group_menu.app.color_boxes == {"Group1": "box-red", "Group2": "box-blue", "Group3": "box-red"}
+
+        # Rebuilding after a color change only creates the new color's box
+        mock_create.reset_mock()
+        group_menu.app.colors["Group2"] = "green"
+        GroupMenu.build_menu(group_menu)
+        mock_create.assert_called_once_with("green")
+        assert group_menu.app.color_boxes["Group2"] == "box-green"
+        assert "blue" not in group_menu._color_box_cache  # noqa: SLF001
+
+
+def test_menu_rebuilt_on_post_only_after_change(group_menu: GroupMenu) -> None:
+    """Test that opening the menu rebuilds it only when groups changed since the last build."""
+    group_menu.app.groups = {"Group1": []}
+
+    group_menu._rebuild_if_changed()  # noqa: SLF001
+    group_menu.build_menu.assert_not_called()
+
+    GroupMenu.groups_changed(group_menu)
+    group_menu.current_group.set.assert_called_with("Group1")
+    group_menu._rebuild_if_changed()  # noqa: SLF001
+    group_menu._rebuild_if_changed()  # noqa: SLF001
+    group_menu.build_menu.assert_called_once()
+
+
 def test_new_group_success(group_menu: GroupMenu) -> None:
     """Test creating a new group successfully."""
     with (
@@ -197,7 +233,7 @@ def test_new_group_success(group_menu: GroupMenu) -> None:
         assert group_menu.app.colors["3.5"] == "#ff0000"
 
         # Verify menu was rebuilt
-        group_menu.build_menu.assert_called_once()
+        group_menu.groups_changed.assert_called_once()
 
 
 def test_new_group_invalid_name(group_menu: GroupMenu) -> None:
@@ -211,7 +247,7 @@ def test_new_group_invalid_name(group_menu: GroupMenu) -> None:
         # Verify no changes were made
         assert "Group1" in group_menu.app.groups  # Already existed
         assert len(group_menu.app.groups) == 2  # No new groups added
-        group_menu.build_menu.assert_not_called()
+        group_menu.groups_changed.assert_not_called()
 
 
 def test_new_group_cancelled_color(group_menu: GroupMenu) -> None:
@@ -222,14 +258,14 @@ def test_new_group_cancelled_color(group_menu: GroupMenu) -> None:
         patch("tkinter.colorchooser.askcolor", return_value=(None, None)),
         patch("tkinter.simpledialog.messagebox.showerror"),
     ):
-        # Reset the build_menu mock
-        group_menu.build_menu.reset_mock()
+        # Reset the groups_changed mock
+        group_menu.groups_changed.reset_mock()
 
         group_menu.new_group()
 
         # Verify no group was added
         assert "3.5" not in group_menu.app.groups
-        group_menu.build_menu.assert_not_called()
+        group_menu.groups_changed.assert_not_called()
 
 
 def test_delete_group_success(group_menu: GroupMenu) -> None:
@@ -241,7 +277,7 @@ def test_delete_group_success(group_menu: GroupMenu) -> None:
 
     with (
         patch("tkinter.messagebox.askyesno", return_value=True),
-        patch.object(GroupMenu, "build_menu"),
+        patch.object(GroupMenu, "groups_changed"),
         patch.object(GroupMenu, "_check_group_selected", return_value="Group1"),
     ):
         group_menu.delete_group()
@@ -253,7 +289,7 @@ def test_delete_group_success(group_menu: GroupMenu) -> None:
         mock_comp.delete.assert_called_once()
 
         # Verify menu was rebuilt
-        assert group_menu.build_menu.called
+        assert group_menu.groups_changed.called
 
 
 def test_delete_group_cancelled(group_menu: GroupMenu) -> None:
@@ -265,14 +301,14 @@ def test_delete_group_cancelled(group_menu: GroupMenu) -> None:
         patch("tkinter.messagebox.askyesno", return_value=False),
         patch.object(GroupMenu, "_check_group_selected", return_value="Group1"),
     ):
-        # Reset the build_menu mock
-        group_menu.build_menu.reset_mock()
+        # Reset the groups_changed mock
+        group_menu.groups_changed.reset_mock()
 
         group_menu.delete_group()
 
         # Verify group was not deleted
         assert "Group1" in group_menu.app.groups
-        group_menu.build_menu.assert_not_called()
+        group_menu.groups_changed.assert_not_called()
 
 
 def test_rename_group_success(group_menu: GroupMenu) -> None:
@@ -306,7 +342,7 @@ def test_rename_group_success(group_menu: GroupMenu) -> None:
         assert group_menu.app.colors["3.5"] == "red"
 
         # Verify menu was rebuilt
-        group_menu.build_menu.assert_called_once()
+        group_menu.groups_changed.assert_called_once()
 
         # Verify current group was set
         group_menu.current_group.set.assert_called_with("3.5")
@@ -324,8 +360,8 @@ def test_rename_group_invalid_name(group_menu: GroupMenu) -> None:
         patch.object(GroupMenu, "_prompt_group_name", return_value="Group2"),
         patch.object(GroupMenu, "_validate_group_name", return_value=False),
     ):
-        # Reset the build_menu mock
-        group_menu.build_menu.reset_mock()
+        # Reset the groups_changed mock
+        group_menu.groups_changed.reset_mock()
 
         group_menu.rename_group()
 
@@ -333,7 +369,7 @@ def test_rename_group_invalid_name(group_menu: GroupMenu) -> None:
         assert "Group1" in group_menu.app.groups
         assert "Group2" in group_menu.app.groups
         assert len(group_menu.app.groups) == 2
-        group_menu.build_menu.assert_not_called()
+        group_menu.groups_changed.assert_not_called()
 
 
 def test_set_group_color(group_menu: GroupMenu) -> None:
@@ -344,7 +380,7 @@ def test_set_group_color(group_menu: GroupMenu) -> None:
     with (
         patch.object(GroupMenu, "_check_group_selected", return_value="Group1"),
         patch("tkinter.colorchooser.askcolor", return_value=((0, 255, 0), "#00ff00")),
-        patch.object(GroupMenu, "build_menu"),
+        patch.object(GroupMenu, "groups_changed"),
     ):
         group_menu.set_group_color()
 
@@ -352,7 +388,7 @@ def test_set_group_color(group_menu: GroupMenu) -> None:
         assert group_menu.app.colors["Group1"] == "#00ff00"
 
         # Verify menu was rebuilt
-        assert group_menu.build_menu.called
+        assert group_menu.groups_changed.called
 
 
 def test_set_group_color_cancelled(group_menu: GroupMenu) -> None:
@@ -364,14 +400,14 @@ def test_set_group_color_cancelled(group_menu: GroupMenu) -> None:
         patch.object(GroupMenu, "_check_group_selected", return_value="Group1"),
         patch("tkinter.colorchooser.askcolor", return_value=(None, None)),
     ):
-        # Reset the build_menu mock
-        group_menu.build_menu.reset_mock()
+        # Reset the groups_changed mock
+        group_menu.groups_changed.reset_mock()
 
         group_menu.set_group_color()
 
         # Verify color was not updated
         assert group_menu.app.colors["Group1"] == "red"
-        group_menu.build_menu.assert_not_called()
+        group_menu.groups_changed.assert_not_called()
 
 
 def test_change_group(group_menu: GroupMenu) -> None: